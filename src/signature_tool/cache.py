@@ -0,0 +1,122 @@
+# ================================================================================
+# Author: Vivek Patel
+# Title: AI Engineer | Computer Vision Specialist
+# Website: https://vivekapatel.com
+# Email: contact@vivekapatel.com
+# Upwork: https://www.upwork.com/freelancers/vivekpatel99?mp_source=share
+# Created: 2025-11-21
+# ================================================================================
+"""
+On-disk cache of files known to carry a signature.
+
+Lets repeated runs skip reading files that were already signed and have
+not been modified since.
+
+Runs merge their entries into whatever is on disk when they save, so
+concurrent runs over different trees keep each other's entries. Two runs
+saving at the same moment may still lose one side's latest entries; that
+only costs a re-read of those files on a later run.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+
+def default_cache_path() -> Path:
+    """Return the default cache location (~/.cache/signature_tool/index.json)."""
+    return Path.home() / ".cache" / "signature_tool" / "index.json"
+
+
+class SignatureCache:
+    """Maps file paths to the (mtime, size) at which they were seen signed."""
+
+    def __init__(self, email: str, path: Optional[Path] = None):
+        """
+        Initialize cache.
+
+        Args:
+            email: Signature email; entries recorded for another email are discarded
+            path: Path to cache file (default: ~/.cache/signature_tool/index.json)
+        """
+        self.path = Path(path) if path else default_cache_path()
+        self.key = hashlib.sha256(email.encode('utf-8')).hexdigest()
+        self.files: Dict[str, List[int]] = self._load()
+        # Paths confirmed signed during this run
+        self._seen: Set[str] = set()
+        # Directory prefixes whose unseen entries are dropped on save
+        self._pruned_roots: List[str] = []
+
+    def _load(self) -> Dict[str, List[int]]:
+        """Load cached entries, ignoring missing, corrupt or stale caches."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('key') != self.key:
+            return {}
+        files = data.get('files')
+        if not isinstance(files, dict):
+            return {}
+        return files
+
+    def is_signed(self, file_path: str, st: os.stat_result) -> bool:
+        """Check if file was signed and has not changed since."""
+        # mtime alone can be carried over by cp -p, rsync -t or tar
+        if self.files.get(file_path) == [st.st_mtime_ns, st.st_size]:
+            self._seen.add(file_path)
+            return True
+        return False
+
+    def mark_signed(self, file_path: str, st: os.stat_result):
+        """Record that file carries a signature at the given stat state."""
+        self.files[file_path] = [st.st_mtime_ns, st.st_size]
+        self._seen.add(file_path)
+
+    def prune_unseen(self, root):
+        """
+        Drop entries under root that were not seen signed during this run.
+
+        Call only after a complete walk of root, so entries for deleted,
+        moved or no longer signed files stop accumulating.
+
+        Args:
+            root: Directory that was fully processed
+        """
+        self._pruned_roots.append(os.path.join(os.path.abspath(root), ''))
+
+    def save(self):
+        """Merge this run's entries into the cache on disk, atomically."""
+        # Re-read the index so entries saved by concurrent runs are kept
+        files = self._load()
+        if self._pruned_roots:
+            roots = tuple(self._pruned_roots)
+            files = {
+                path: entry for path, entry in files.items()
+                if path in self._seen or not path.startswith(roots)
+            }
+        for path in self._seen:
+            files[path] = self.files[path]
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f"{self.path.name}.", suffix=".tmp", dir=self.path.parent
+            )
+            try:
+                with open(fd, 'w') as f:
+                    json.dump({'key': self.key, 'files': files}, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"Warning: Could not write cache {self.path}: {e}")
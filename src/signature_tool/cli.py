@@ -12,16 +12,15 @@
 Command-line interface for signature tool.
 
 Usage:
-    add-signatures [--dry-run] [--force] [--path PATH]
+    add-signatures [--dry-run] [--force] [--path PATH] [--jobs N] [--cache]
+                   [--max-size BYTES]
 """
 
+import os
 import sys
 import argparse
 from pathlib import Path
 
-from .config import load_config, ConfigError
-from .processor import process_files
-
 
 def main():
     """Main entry point for CLI."""
@@ -34,6 +33,9 @@ Examples:
   add-signatures --dry-run          # Show what would change
   add-signatures --force            # Update existing signatures
   add-signatures --path ./src       # Process specific directory
+  add-signatures --jobs 1           # Process files sequentially
+  add-signatures --cache            # Skip files signed by a previous run
+  add-signatures --max-size 0       # Don't skip large files
         '''
     )
 
@@ -62,8 +64,40 @@ Examples:
         help='Show detailed output'
     )
 
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of files to process in parallel (default: number of CPUs)'
+    )
+
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Remember signed files in ~/.cache/signature_tool and skip them '
+             'on later runs until they change'
+    )
+
+    parser.add_argument(
+        '--max-size',
+        type=int,
+        metavar='BYTES',
+        help='Skip files larger than this many bytes, 0 for no limit '
+             '(default: 1048576)'
+    )
+
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.max_size is not None and args.max_size < 0:
+        parser.error('--max-size must not be negative')
+
+    # Imported only once arguments are valid, so --help and usage errors
+    # don't pay for loading the processing modules
+    from .config import load_config, ConfigError
+    from .processor import DEFAULT_MAX_SIZE, process_files
+
     # Load configuration
     try:
         config = load_config()
@@ -88,7 +122,12 @@ Examples:
             config.to_dict(),
             args.path,
             dry_run=args.dry_run,
-            force=args.force
+            force=args.force,
+            jobs=args.jobs,
+            use_cache=args.cache,
+            max_size=DEFAULT_MAX_SIZE if args.max_size is None else args.max_size,
+            # The list of modified files is only ever printed in verbose mode
+            collect_files=args.verbose
         )
     except Exception as e:
         print(f"Error processing files: {e}", file=sys.stderr)
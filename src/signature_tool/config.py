@@ -17,6 +17,14 @@ import os
 from pathlib import Path
 from typing import Dict, Optional
 
+# Use orjson when available (faster startup for hook-driven runs);
+# its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 
 class ConfigError(Exception):
     """Raised when configuration is invalid or missing."""
@@ -50,8 +58,8 @@ class Config:
         # Load global config
         if self.global_path.exists():
             try:
-                with open(self.global_path, 'r') as f:
-                    config = json.load(f)
+                with open(self.global_path, 'rb') as f:
+                    config = _loads(f.read())
             except json.JSONDecodeError as e:
                 raise ConfigError(f"Invalid JSON in {self.global_path}: {e}")
         else:
@@ -63,8 +71,8 @@ class Config:
         # Load and merge local config if it exists
         if self.local_path.exists():
             try:
-                with open(self.local_path, 'r') as f:
-                    local_config = json.load(f)
+                with open(self.local_path, 'rb') as f:
+                    local_config = _loads(f.read())
                     # Merge: local overrides global
                     config.update(local_config)
             except json.JSONDecodeError as e:
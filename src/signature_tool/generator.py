@@ -13,6 +13,7 @@ Generates properly formatted signatures with appropriate comment syntax.
 """
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Optional
 
 
@@ -59,10 +60,17 @@ COMMENT_STYLES = {
     '.less': 'css',
 }
 
+# Config fields that appear in the signature block
+SIGNATURE_FIELDS = ('author', 'title', 'website', 'email', 'upwork')
+
 
 class SignatureGenerator:
     """Generates formatted signatures for different file types."""
 
+    # Stands in for the creation date inside the cached templates
+    _DATE_PLACEHOLDER = "__DATE__"
+    _DATE_PLACEHOLDER_B = b"__DATE__"
+
     def __init__(self, config: Dict, width: int = 80):
         """
         Initialize signature generator.
@@ -74,6 +82,21 @@ class SignatureGenerator:
         self.config = config
         self.width = width
         self.separator = "=" * width
+        self._today = datetime.now().strftime("%Y-%m-%d")
+
+        # Config and width are fixed for the generator's lifetime, so each
+        # comment style is formatted once and only the date varies per file.
+        lines = self._build_lines(self._DATE_PLACEHOLDER)
+        self._templates: Dict[str, str] = {
+            style: self._format_signature(lines, style)
+            for style in set(COMMENT_STYLES.values())
+        }
+        self._templates_b: Dict[str, bytes] = {
+            style: template.encode('utf-8') for style, template in self._templates.items()
+        }
+        self._templates_crlf: Dict[str, bytes] = {
+            style: template.replace(b'\n', b'\r\n') for style, template in self._templates_b.items()
+        }
 
     def generate(self, file_extension: str, creation_date: Optional[str] = None) -> str:
         """
@@ -92,10 +115,35 @@ class SignatureGenerator:
         if file_extension not in COMMENT_STYLES:
             raise ValueError(f"Unsupported file extension: {file_extension}")
 
-        comment_style = COMMENT_STYLES[file_extension]
-        date = creation_date or datetime.now().strftime("%Y-%m-%d")
+        template = self._templates[COMMENT_STYLES[file_extension]]
+        return template.replace(self._DATE_PLACEHOLDER, creation_date or self._today)
+
+    def generate_bytes(self, file_extension: str, creation_date: Optional[str] = None,
+                       crlf: bool = False) -> bytes:
+        """
+        Generate signature for given file type as UTF-8 encoded bytes.
+
+        Args:
+            file_extension: File extension (e.g., '.py', '.js')
+            creation_date: Creation date (YYYY-MM-DD), uses today if None
+            crlf: If True, end lines with CRLF instead of LF
+
+        Returns:
+            Encoded signature, ready to be prepended to raw file content
+
+        Raises:
+            ValueError: If file extension is not supported
+        """
+        if file_extension not in COMMENT_STYLES:
+            raise ValueError(f"Unsupported file extension: {file_extension}")
+
+        templates = self._templates_crlf if crlf else self._templates_b
+        template = templates[COMMENT_STYLES[file_extension]]
+        date = (creation_date or self._today).encode('utf-8')
+        return template.replace(self._DATE_PLACEHOLDER_B, date)
 
-        # Build signature lines
+    def _build_lines(self, date: str) -> list:
+        """Build the signature lines (without comment syntax)."""
         lines = [
             f"Author: {self.config['author']}",
         ]
@@ -113,61 +161,49 @@ class SignatureGenerator:
 
         lines.append(f"Created: {date}")
 
-        # Format with appropriate comment syntax
-        return self._format_signature(lines, comment_style)
+        return lines
 
     def _format_signature(self, lines: list, style: str) -> str:
         """Format signature lines with appropriate comment syntax."""
-        if style == 'hash':
-            return self._format_hash(lines)
-        elif style == 'slash':
-            return self._format_slash(lines)
-        elif style == 'html':
-            return self._format_html(lines)
-        elif style == 'css':
-            return self._format_css(lines)
-        else:
+        try:
+            formatter = self._FORMATTERS[style]
+        except KeyError:
             raise ValueError(f"Unknown comment style: {style}")
+        return formatter(self, lines)
 
     def _format_hash(self, lines: list) -> str:
         """Format with hash comments (#)."""
-        result = [f"# {self.separator}"]
-        for line in lines:
-            result.append(f"# {line}")
-        result.append(f"# {self.separator}")
-        result.append("")  # Empty line after signature
-        return "\n".join(result)
+        return self._format_line_comments(lines, "# ")
 
     def _format_slash(self, lines: list) -> str:
         """Format with double-slash comments (//)."""
-        result = [f"// {self.separator}"]
-        for line in lines:
-            result.append(f"// {line}")
-        result.append(f"// {self.separator}")
-        result.append("")  # Empty line after signature
-        return "\n".join(result)
+        return self._format_line_comments(lines, "// ")
 
     def _format_html(self, lines: list) -> str:
         """Format with HTML-style comments (<!-- -->)."""
-        result = ["<!--"]
-        result.append(self.separator)
-        for line in lines:
-            result.append(line)
-        result.append(self.separator)
-        result.append("-->")
-        result.append("")  # Empty line after signature
-        return "\n".join(result)
+        return self._format_block_comment(lines, "<!--", "-->")
 
     def _format_css(self, lines: list) -> str:
         """Format with CSS-style comments (/* */)."""
-        result = ["/*"]
-        result.append(self.separator)
-        for line in lines:
-            result.append(line)
-        result.append(self.separator)
-        result.append("*/")
-        result.append("")  # Empty line after signature
-        return "\n".join(result)
+        return self._format_block_comment(lines, "/*", "*/")
+
+    def _format_line_comments(self, lines: list, prefix: str) -> str:
+        """Prefix every line, separators included, with a line comment marker."""
+        separator = f"{prefix}{self.separator}\n"
+        return separator + "".join(f"{prefix}{line}\n" for line in lines) + separator
+
+    def _format_block_comment(self, lines: list, opener: str, closer: str) -> str:
+        """Wrap the lines and separators in a single block comment."""
+        body = "".join(f"{line}\n" for line in lines)
+        return f"{opener}\n{self.separator}\n{body}{self.separator}\n{closer}\n"
+
+    # Comment style to formatter dispatch table
+    _FORMATTERS = {
+        'hash': _format_hash,
+        'slash': _format_slash,
+        'html': _format_html,
+        'css': _format_css,
+    }
 
 
 def generate_signature(config: Dict, file_extension: str, creation_date: Optional[str] = None) -> str:
@@ -182,8 +218,16 @@ def generate_signature(config: Dict, file_extension: str, creation_date: Optiona
     Returns:
         Formatted signature string
     """
-    generator = SignatureGenerator(config)
-    return generator.generate(file_extension, creation_date)
+    key = tuple((field, config[field]) for field in SIGNATURE_FIELDS if field in config)
+    # Cached generators outlive the day they were built, so pass today's date explicitly
+    date = creation_date or datetime.now().strftime("%Y-%m-%d")
+    return _cached_generator(key).generate(file_extension, date)
+
+
+@lru_cache(maxsize=8)
+def _cached_generator(key: tuple) -> SignatureGenerator:
+    """Return a shared generator for the given signature fields."""
+    return SignatureGenerator(dict(key))
 
 
 def is_supported_file(file_extension: str) -> bool:
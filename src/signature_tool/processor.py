@@ -13,31 +13,183 @@ Handles reading files, detecting existing signatures, and adding new ones.
 """
 
 import os
+import re
+import stat
+import codecs
 import fnmatch
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Set
+from typing import Iterable, Optional, List, Set, Tuple
 
-from .generator import generate_signature, is_supported_file
+from .cache import SignatureCache
+from .generator import COMMENT_STYLES, SignatureGenerator, is_supported_file
 
 
 # Directories to skip when scanning
-SKIP_DIRS = {
+SKIP_DIRS = frozenset({
     '.git', '.venv', 'venv', 'env', '__pycache__', 'node_modules',
     '.pytest_cache', '.mypy_cache', 'dist', 'build', '.egg-info',
     '.tox', 'htmlcov', '.coverage', '.idea', '.vscode'
-}
+})
 
 # Files to skip
-SKIP_FILES = {
+SKIP_FILES = frozenset({
     '.gitignore', '.dockerignore', 'LICENSE', 'CHANGELOG',
     'requirements.txt', 'package-lock.json', 'yarn.lock', 'poetry.lock'
-}
+})
+
+# Number of leading bytes read first to check for text and an existing signature
+PROBE_SIZE = 4096
+
+# Futures kept in flight per worker thread when processing in parallel
+PENDING_PER_JOB = 4
+
+# Files larger than this are assumed not to be hand-written source (1 MiB)
+DEFAULT_MAX_SIZE = 1024 * 1024
+
+
+def _read_remaining(fd: int, size_hint: int) -> bytes:
+    """Read from a raw file descriptor until end of file."""
+    chunks = []
+    while True:
+        chunk = os.read(fd, max(size_hint, 1 << 16))
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def _write_all(fd: int, data: bytes):
+    """Write all of data to a raw file descriptor."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_bytes(path, data: bytes):
+    """Replace a file's contents in place through a raw file descriptor."""
+    fd = os.open(path, os.O_WRONLY | os.O_TRUNC | os.O_CREAT, 0o644)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _copy_metadata(src: str, dst: str, st: os.stat_result):
+    """Give dst the ownership, permission bits and extended attributes of src."""
+    # chown first: changing the owner may clear setuid/setgid bits
+    if hasattr(os, 'chown'):
+        os.chown(dst, st.st_uid, st.st_gid)
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+
+    # Extended attributes also carry POSIX ACLs and SELinux labels (Linux only)
+    if hasattr(os, 'listxattr'):
+        try:
+            names = os.listxattr(src)
+        except OSError:
+            names = []
+        for name in names:
+            os.setxattr(dst, name, os.getxattr(src, name))
+
+
+def _replace_bytes(path: str, data: bytes, st: os.stat_result):
+    """
+    Atomically replace a file's contents.
+
+    The data is written to a temporary file next to the target which is then
+    renamed over it, so an interrupted run never leaves a half-written file.
+    Whenever the new file could not be made indistinguishable from the old
+    one (hard links, ownership or attributes that can't be copied, rename
+    not permitted), the file is rewritten in place instead.
+
+    Args:
+        path: File to replace (symlinks are followed)
+        data: New file content
+        st: Stat result of the file, used to carry its metadata over
+    """
+    # Replace the link target, not the link itself
+    if os.path.islink(path):
+        path = os.path.realpath(path)
+
+    # Other hard links would keep pointing at the old, unsigned inode
+    if st.st_nlink > 1:
+        _write_bytes(path, data)
+        return
+
+    # mkstemp creates the file exclusively (O_EXCL), so a pre-planted file or
+    # symlink at the temporary name is never followed or truncated
+    directory, name = os.path.split(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{name}.sigtmp.", dir=directory or '.')
+    except PermissionError:
+        # Directory is not writable; fall back to rewriting the file in place
+        _write_bytes(path, data)
+        return
+
+    # A failed or interrupted write (ENOSPC, EIO, Ctrl-C) must not leave the
+    # partial temporary file behind in the user's tree
+    try:
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+
+    try:
+        _copy_metadata(path, tmp_path, st)
+        os.replace(tmp_path, path)
+    except OSError:
+        # E.g. a sticky-bit directory, or an owner we are not allowed to set
+        _remove_quietly(tmp_path)
+        _write_bytes(path, data)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+
+
+def _remove_quietly(path: str):
+    """Delete a file, ignoring it if it is already gone."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _is_text(data: bytes) -> bool:
+    """Check that the start of the data decodes as UTF-8."""
+    # An incremental decoder tolerates a multi-byte character cut at the probe boundary
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(data[:PROBE_SIZE])
+    except UnicodeDecodeError:
+        return False
+    return True
 
 
 class FileProcessor:
     """Processes files to add or update signatures."""
 
-    def __init__(self, config: dict, dry_run: bool = False, force: bool = False):
+    # A signature block in any supported comment style, plus the blank
+    # lines around it
+    _SIGNATURE_RE = re.compile(
+        r'^(?:[ \t]*\r?\n)*'
+        r'(?:'
+        r'(?P<prefix>#|//) =+\r?\n(?:(?P=prefix) .*\n)*?(?P=prefix) =+'  # hash / slash
+        r'|<!--\r?\n=+\r?\n(?:.*\n)*?=+\r?\n-->'                       # html
+        r'|/\*\r?\n=+\r?\n(?:.*\n)*?=+\r?\n\*/'                       # css
+        r')'
+        r'[ \t]*(?:\r?\n|\Z)(?:[ \t]*\r?\n)*',
+        re.MULTILINE
+    )
+    _SIGNATURE_RE_B = re.compile(_SIGNATURE_RE.pattern.encode('ascii'), re.MULTILINE)
+
+    def __init__(self, config: dict, dry_run: bool = False, force: bool = False,
+                 jobs: int = 1, cache: Optional[SignatureCache] = None,
+                 max_size: int = DEFAULT_MAX_SIZE, collect_files: bool = True):
         """
         Initialize file processor.
 
@@ -45,15 +197,29 @@ class FileProcessor:
             config: Configuration dictionary
             dry_run: If True, don't modify files (just report what would change)
             force: If True, update existing signatures
+            jobs: Number of worker threads used when processing directories
+            cache: Optional cache of already-signed files from previous runs
+            max_size: Skip files larger than this many bytes (0 for no limit)
+            collect_files: If False, don't record modified paths in the stats
         """
         self.config = config
         self.dry_run = dry_run
         self.force = force
+        self.jobs = max(1, jobs)
+        self.cache = cache
+        self.max_size = max_size
+        self.collect_files = collect_files
         self.email = config['email']
+        self._email_bytes = self.email.encode('utf-8')
+        # One generator for the whole run; its templates are built once
+        self._generator = SignatureGenerator(config)
         # Get ignore patterns from config (default to empty list)
         self.ignore_patterns = config.get('ignore', [])
+        # (st_dev, st_ino) of files already taken during a directory run
+        self._claimed: Optional[Set[Tuple[int, int]]] = None
+        self._claim_lock = threading.Lock()
 
-    def should_ignore(self, file_path: Path) -> bool:
+    def should_ignore(self, file_path: str) -> bool:
         """
         Check if file matches any ignore pattern.
 
@@ -63,8 +229,11 @@ class FileProcessor:
         Returns:
             True if file should be ignored
         """
-        file_str = str(file_path)
-        filename = file_path.name
+        if not self.ignore_patterns:
+            return False
+
+        file_str = os.path.normpath(file_path)
+        filename = os.path.basename(file_str)
 
         for pattern in self.ignore_patterns:
             # Check against full path
@@ -78,120 +247,180 @@ class FileProcessor:
                 return True
         return False
 
-    def has_signature(self, content: str) -> bool:
+    def has_signature(self, content) -> bool:
         """
         Check if file already has a signature.
 
         Args:
-            content: File content
+            content: File content, as ``bytes`` or ``str``
 
         Returns:
             True if signature (with user's email) found in first 20 lines
         """
-        lines = content.split('\n')[:20]
-        return any(self.email in line for line in lines)
-
-    def process_file(self, file_path: Path) -> bool:
+        email = self._email_bytes if isinstance(content, bytes) else self.email
+        return content.find(email, 0, self._head_end(content)) != -1
+
+    @staticmethod
+    def _head_end(content) -> int:
+        """Return the offset where line 20 ends, without splitting the file."""
+        newline = b'\n' if isinstance(content, bytes) else '\n'
+        end = -1
+        for _ in range(20):
+            end = content.find(newline, end + 1)
+            if end == -1:
+                return len(content)
+        return end
+
+    def process_file(self, file_path: str, ext: Optional[str] = None) -> bool:
         """
         Process a single file, adding signature if needed.
 
         Args:
-            file_path: Path to file
+            file_path: Path to file (``Path`` objects are accepted as well)
+            ext: File extension if already known (e.g., '.py')
 
         Returns:
             True if file was modified (or would be modified in dry-run mode)
         """
+        file_path = os.fspath(file_path)
+        if ext is None:
+            ext = os.path.splitext(file_path)[1]
+
         # Check if file should be ignored
         if self.should_ignore(file_path):
             return False
 
         # Check if file extension is supported
-        if not is_supported_file(file_path.suffix):
+        if not is_supported_file(ext):
             return False
 
         # Skip if file doesn't exist or is not a file
-        if not file_path.is_file():
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        if not stat.S_ISREG(st.st_mode):
+            return False
+
+        # Skip empty files and files too large to be source code
+        if st.st_size == 0 or (self.max_size and st.st_size > self.max_size):
             return False
 
-        # Read file content
+        # Hard links and symlinks can reach one file by several paths; only
+        # the first one is processed, so no two workers touch the same inode
+        if self._claimed is not None:
+            inode = (st.st_dev, st.st_ino)
+            with self._claim_lock:
+                if inode in self._claimed:
+                    return False
+                self._claimed.add(inode)
+
+        # Skip files signed in a previous run and unchanged since
+        if self.cache is not None:
+            cache_key = os.path.abspath(file_path)
+            if not self.force and self.cache.is_signed(cache_key, st):
+                return False
+
+        # Read file content as raw bytes; the body is never decoded
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (UnicodeDecodeError, PermissionError):
-            # Skip binary files or files we can't read
+            fd = os.open(file_path, os.O_RDONLY)
+        except PermissionError:
+            # Skip files we can't read
             return False
 
-        # Check if signature already exists
-        if self.has_signature(content) and not self.force:
+        try:
+            # Probe the start of the file first, so binary files and files
+            # that already carry a signature are decided without a full read
+            content = os.read(fd, PROBE_SIZE)
+
+            # Skip binary files
+            if not _is_text(content):
+                return False
+
+            # Check if signature already exists
+            signed = self.has_signature(content)
+            if not signed or self.force:
+                # os.read may return less than asked (FUSE, network
+                # filesystems, signals), so read on until end of file
+                content += _read_remaining(fd, st.st_size - len(content))
+                # The first 20 lines may run past the probe
+                signed = signed or self.has_signature(content)
+        finally:
+            os.close(fd)
+
+        if signed and not self.force:
+            if self.cache is not None:
+                self.cache.mark_signed(cache_key, st)
             return False
 
+        # Match the file's line endings so CRLF files stay consistent
+        crlf = content.find(b'\r\n', 0, PROBE_SIZE) != -1
+        newline = b'\r\n' if crlf else b'\n'
+
         # Generate signature
         try:
-            signature = generate_signature(self.config, file_path.suffix)
+            signature = self._generator.generate_bytes(ext, crlf=crlf)
         except ValueError:
             # Unsupported file type
             return False
 
-        # Handle shebang lines (e.g., #!/usr/bin/env python)
-        if content.startswith('#!'):
-            lines = content.split('\n', 1)
-            shebang = lines[0] + '\n'
-            rest = lines[1] if len(lines) > 1 else ''
-
-            if self.force and self.has_signature(rest):
+        # Most files have no shebang, so check for that case first
+        if not content.startswith(b'#!'):
+            if signed:
                 # Remove old signature if forcing update
-                rest = self._remove_old_signature(rest)
+                content = self._remove_old_signature(content)
 
-            new_content = shebang + '\n' + signature + rest
+            new_content = signature + content
         else:
-            if self.force and self.has_signature(content):
+            # Keep shebang line (e.g., #!/usr/bin/env python) first
+            line_end = content.find(b'\n')
+            if line_end == -1:
+                shebang, rest = content + newline, b''
+            else:
+                shebang, rest = content[:line_end + 1], content[line_end + 1:]
+
+            if signed:
                 # Remove old signature if forcing update
-                content = self._remove_old_signature(content)
+                rest = self._remove_old_signature(rest)
 
-            new_content = signature + content
+            new_content = shebang + newline + signature + rest
 
         # Write back (unless dry run)
         if not self.dry_run:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                _replace_bytes(file_path, new_content, st)
             except PermissionError:
                 print(f"Warning: No permission to write {file_path}")
                 return False
 
+            if self.cache is not None:
+                self.cache.mark_signed(cache_key, os.stat(file_path))
+
         return True
 
-    def _remove_old_signature(self, content: str) -> str:
+    def _remove_old_signature(self, content):
         """
         Remove old signature from content.
 
         Args:
-            content: File content
+            content: File content, as ``bytes`` or ``str``
 
         Returns:
             Content with signature removed
         """
-        lines = content.split('\n')
-
-        # Find the end of the signature block
-        # Look for separator line or email in first 20 lines
-        signature_end = 0
-        for i, line in enumerate(lines[:20]):
-            if self.email in line:
-                # Find the end marker (separator or closing comment)
-                for j in range(i, min(i + 5, len(lines))):
-                    if ('=====' in lines[j] or
-                        '-->' in lines[j] or
-                        '*/' in lines[j]):
-                        signature_end = j + 1
-                        break
-                break
-
-        # Skip any empty lines after signature
-        while signature_end < len(lines) and not lines[signature_end].strip():
-            signature_end += 1
+        if isinstance(content, bytes):
+            pattern, email = self._SIGNATURE_RE_B, self._email_bytes
+        else:
+            pattern, email = self._SIGNATURE_RE, self.email
 
-        return '\n'.join(lines[signature_end:])
+        # Only a block carrying the user's email that starts in the first 20 lines counts
+        head_end = self._head_end(content)
+        for match in pattern.finditer(content):
+            if match.start() > head_end:
+                break
+            if email in match.group(0):
+                return content[:match.start()] + content[match.end():]
+        return content
 
     def process_directory(self, directory: Path, files_only: Optional[List[Path]] = None) -> dict:
         """
@@ -204,44 +433,113 @@ class FileProcessor:
         Returns:
             Dictionary with statistics: {'processed': int, 'skipped': int, 'files': list}
         """
-        stats = {
-            'processed': 0,
-            'skipped': 0,
-            'files': []
-        }
+        # Counted in locals and packed into the stats dict once at the end
+        processed = skipped = 0
+        files = []
+        collect_files = self.collect_files
 
         if files_only:
             # Process only specified files
-            for file_path in files_only:
-                if self.process_file(file_path):
-                    stats['processed'] += 1
-                    stats['files'].append(str(file_path))
-                else:
-                    stats['skipped'] += 1
+            candidates = ((file_path, None) for file_path in files_only)
         else:
             # Recursively process directory
-            for root, dirs, files in os.walk(directory):
-                # Skip certain directories
-                dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            candidates = self._iter_files(directory)
 
-                for filename in files:
-                    # Skip certain files
-                    if filename in SKIP_FILES:
-                        continue
+        self._claimed = set()
 
-                    file_path = Path(root) / filename
+        # Files are independent, so they can be processed concurrently;
+        # results are counted here on the calling thread.
+        executor = ThreadPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else None
+        try:
+            if executor:
+                results = self._map_bounded(executor, candidates)
+            else:
+                results = map(self._process_candidate, candidates)
+
+            for file_path, modified in results:
+                if modified:
+                    processed += 1
+                    if collect_files:
+                        files.append(file_path)
+                else:
+                    skipped += 1
+        finally:
+            if executor:
+                executor.shutdown()
+            self._claimed = None
 
-                    if self.process_file(file_path):
-                        stats['processed'] += 1
-                        stats['files'].append(str(file_path))
-                    else:
-                        stats['skipped'] += 1
+        return {
+            'processed': processed,
+            'skipped': skipped,
+            'files': files
+        }
 
-        return stats
+    def _map_bounded(self, executor: ThreadPoolExecutor, candidates: Iterable[Tuple]):
+        """
+        Run _process_candidate on the executor, yielding results in order.
+
+        Unlike executor.map, at most a few futures per worker are pending at
+        any time, so candidates are pulled from the walker lazily.
+        """
+        window = self.jobs * PENDING_PER_JOB
+        pending = deque()
+        for candidate in candidates:
+            pending.append(executor.submit(self._process_candidate, candidate))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def _process_candidate(self, candidate: Tuple) -> Tuple[str, bool]:
+        """Process one (path, extension) pair and return (path, modified)."""
+        file_path, ext = candidate
+        return str(file_path), self.process_file(file_path, ext)
+
+    def _iter_files(self, root):
+        """
+        Recursively yield paths of candidate files under a directory.
+
+        Uses ``os.scandir`` so entry types come from the directory listing
+        itself (no extra stat per entry), and prunes SKIP_DIRS before
+        descending. Only files with a supported extension are yielded.
+
+        Args:
+            root: Directory to scan
+
+        Yields:
+            Tuples of (file path as string, file extension)
+        """
+        try:
+            scanner = os.scandir(root)
+        except OSError:
+            # Unreadable directory, same as os.walk's default behaviour
+            return
+
+        with scanner:
+            for entry in scanner:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in SKIP_DIRS:
+                            yield from self._iter_files(entry.path)
+                    elif entry.is_file():
+                        if name in SKIP_FILES:
+                            continue
+                        # A leading dot marks a hidden file, not an extension
+                        dot = name.rfind('.')
+                        if dot <= 0:
+                            continue
+                        ext = name[dot:]
+                        if ext in COMMENT_STYLES:
+                            yield entry.path, ext
+                except OSError:
+                    continue
 
 
 def process_files(config: dict, path: Path, dry_run: bool = False,
-                  force: bool = False, files_only: Optional[List[Path]] = None) -> dict:
+                  force: bool = False, files_only: Optional[List[Path]] = None,
+                  jobs: int = 1, use_cache: bool = False,
+                  max_size: int = DEFAULT_MAX_SIZE, collect_files: bool = True) -> dict:
     """
     Process files to add signatures.
 
@@ -251,22 +549,35 @@ def process_files(config: dict, path: Path, dry_run: bool = False,
         dry_run: If True, don't modify files
         force: If True, update existing signatures
         files_only: If provided, only process these specific files
+        jobs: Number of worker threads used for directories
+        use_cache: If True, skip files recorded as signed by a previous run
+        max_size: Skip files larger than this many bytes (0 for no limit)
+        collect_files: If False, leave the 'files' list of the stats empty
 
     Returns:
         Statistics dictionary
     """
-    processor = FileProcessor(config, dry_run, force)
-
-    if path.is_file():
-        # Process single file
-        success = processor.process_file(path)
-        return {
-            'processed': 1 if success else 0,
-            'skipped': 0 if success else 1,
-            'files': [str(path)] if success else []
-        }
-    elif path.is_dir():
-        # Process directory
-        return processor.process_directory(path, files_only)
-    else:
-        return {'processed': 0, 'skipped': 0, 'files': [], 'error': 'Path not found'}
+    cache = SignatureCache(config['email']) if use_cache else None
+    processor = FileProcessor(config, dry_run, force, jobs, cache, max_size, collect_files)
+
+    try:
+        if path.is_file():
+            # Process single file
+            success = processor.process_file(path)
+            return {
+                'processed': 1 if success else 0,
+                'skipped': 0 if success else 1,
+                'files': [str(path)] if success and collect_files else []
+            }
+        elif path.is_dir():
+            # Process directory
+            stats = processor.process_directory(path, files_only)
+            if cache is not None and not files_only:
+                # A complete walk has seen every file under path that is still signed
+                cache.prune_unseen(path)
+            return stats
+        else:
+            return {'processed': 0, 'skipped': 0, 'files': [], 'error': 'Path not found'}
+    finally:
+        if cache is not None:
+            cache.save()